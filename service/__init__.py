@@ -22,16 +22,35 @@ This module creates and configures the Flask app and sets up the logging
 and SQL database
 """
 import sys
+import orjson
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from service import config
 from service.common import log_handlers
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson
+
+    Makes request.get_json() and jsonify() use orjson instead of the
+    stdlib json module. The default=str handles Decimal prices.
+    """
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str).decode()
+
+
 # NOTE: Do not change the order of this code
 # The Flask app must be created
 # BEFORE you import modules that depend on it !!!
 
 # Create the Flask aoo
 app = Flask(__name__)  # pylint: disable=invalid-name
+app.json_provider_class = ORJSONProvider
+app.json = ORJSONProvider(app)
 
 # Load Configurations
 app.config.from_object(config)
@@ -33,6 +33,7 @@ from enum import Enum
 from decimal import Decimal
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import delete, update
 
 logger = logging.getLogger("flask.app")
 
@@ -79,6 +80,12 @@ class Product(db.Model):
     category = db.Column(
         db.Enum(Category), nullable=False, server_default=(Category.UNKNOWN.name)
     )
+    updated_at = db.Column(
+        db.DateTime,
+        nullable=False,
+        server_default=db.func.now(),
+        onupdate=db.func.now(),
+    )
 
     ##################################################
     # INSTANCE METHODS
@@ -112,8 +119,13 @@ class Product(db.Model):
         db.session.delete(self)
         db.session.commit()
 
-    def serialize(self) -> dict:
-        """Serializes a Product into a dictionary"""
+    def to_json_dict(self) -> dict:
+        """Returns a Product as a dict of JSON-primitive values
+
+        The Decimal price and Category enum are pre-flattened to str so
+        orjson can encode the dict entirely in C without falling back to
+        its default callback.
+        """
         return {
             "id": self.id,
             "name": self.name,
@@ -123,6 +135,10 @@ class Product(db.Model):
             "category": self.category.name  # convert enum to string
         }
 
+    def serialize(self) -> dict:
+        """Serializes a Product into a dictionary"""
+        return self.to_json_dict()
+
     def deserialize(self, data: dict):
         """
         Deserializes a Product from a dictionary
@@ -169,12 +185,73 @@ class Product(db.Model):
         app.app_context().push()
         db.create_all()  # make our sqlalchemy tables
 
+    @classmethod
+    def bulk_create(cls, products: list):
+        """Creates a batch of Products with a single commit
+
+        Issues one add_all plus one commit instead of an INSERT/COMMIT
+        round-trip per Product.
+
+        :param products: the Products to create
+        :type products: list
+
+        """
+        logger.info("Creating %d Products in bulk", len(products))
+        for product in products:
+            # id must be none to generate next primary key
+            product.id = None
+        db.session.add_all(products)
+        db.session.commit()
+
     @classmethod
     def all(cls) -> list:
         """Returns all of the Products in the database"""
         logger.info("Processing all Products")
         return cls.query.all()
 
+    @classmethod
+    # pylint: disable=too-many-arguments
+    def list_dicts(cls, name=None, category=None, available=None, cursor=None, limit=None):
+        """Returns Product rows as plain column tuples
+
+        This is a values-only query for the read-heavy list endpoint. It
+        skips ORM instance construction and attribute instrumentation
+        per row, which dominates the cost for wide result sets.
+
+        :param name: optional name to filter on
+        :type name: str
+        :param category: optional Category to filter on
+        :type category: enum
+        :param available: optional availability to filter on
+        :type available: bool
+        :param cursor: optional id to page from (keyset pagination)
+        :type cursor: int
+        :param limit: optional maximum number of rows to return
+        :type limit: int
+
+        :return: an iterable of Row objects with the Product columns
+        :rtype: Query
+
+        """
+        logger.info("Processing values-only list query")
+        query = db.session.query(
+            cls.id, cls.name, cls.description, cls.price, cls.available, cls.category
+        )
+        if name is not None:
+            query = query.filter(cls.name == name)
+        if category is not None:
+            query = query.filter(cls.category == category)
+        if available is not None:
+            query = query.filter(cls.available == available)
+        if cursor is not None:
+            # keyset pagination stays fast at deep pages, unlike OFFSET
+            query = query.filter(cls.id > cursor)
+        if cursor is not None or limit is not None:
+            query = query.order_by(cls.id)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
     @classmethod
     def find(cls, product_id: int):
         """Finds a Product by it's ID
@@ -189,6 +266,62 @@ class Product(db.Model):
         logger.info("Processing lookup for id %s ...", product_id)
         return cls.query.get(product_id)
 
+    @classmethod
+    def update_by_id(cls, product_id: int, data: dict):
+        """Updates a Product with a single UPDATE ... RETURNING statement
+
+        The existence check and the write happen in one round-trip, so
+        there is no separate SELECT and no read-then-write race. The
+        data is validated through deserialize first, which raises
+        DataValidationError on bad input.
+
+        :param product_id: the id of the Product to update
+        :type product_id: int
+        :param data: a dictionary containing the Product data
+        :type data: dict
+
+        :return: the updated Product, or None if not found
+        :rtype: Product
+
+        """
+        logger.info("Updating Product %s in place", product_id)
+        fields = cls().deserialize(data)
+        stmt = (
+            update(cls)
+            .where(cls.id == product_id)
+            .values(
+                name=fields.name,
+                description=fields.description,
+                price=fields.price,
+                available=fields.available,
+                category=fields.category,
+            )
+            .returning(cls)
+        )
+        updated = db.session.scalars(stmt).one_or_none()
+        db.session.commit()
+        return updated
+
+    @classmethod
+    def delete_by_id(cls, product_id: int) -> bool:
+        """Deletes a Product with a single DELETE ... RETURNING statement
+
+        The database does the existence check and the delete atomically
+        in one round-trip instead of a SELECT followed by a DELETE.
+
+        :param product_id: the id of the Product to delete
+        :type product_id: int
+
+        :return: True if a Product was deleted, False if not found
+        :rtype: bool
+
+        """
+        logger.info("Deleting Product %s", product_id)
+        stmt = delete(cls).where(cls.id == product_id).returning(cls.id)
+        deleted = db.session.execute(stmt).scalar_one_or_none()
+        db.session.commit()
+        return deleted is not None
+
     @classmethod
     def find_by_name(cls, name: str) -> list:
         """Returns all Products with the given name
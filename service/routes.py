@@ -19,8 +19,9 @@
 Product Store Service with UI
 """
 import logging
+import orjson
 from flask import jsonify, request, abort
-from flask import url_for  # noqa: F401 pylint: disable=unused-import
+from flask.views import MethodView
 from service.models import Product, Category
 from service.common import status  # HTTP Status Codes
 from . import app
@@ -28,6 +29,38 @@ from . import app
 
 logger = logging.getLogger("flask.app")
 
+# HTTP status codes bound to module-level names so each use is a
+# single global load instead of a module attribute lookup
+_OK = status.HTTP_200_OK
+_CREATED = status.HTTP_201_CREATED
+_NO_CONTENT = status.HTTP_204_NO_CONTENT
+_NOT_MODIFIED = status.HTTP_304_NOT_MODIFIED
+_BAD_REQUEST = status.HTTP_400_BAD_REQUEST
+_NOT_FOUND = status.HTTP_404_NOT_FOUND
+_UNSUPPORTED_MEDIA_TYPE = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+# Category name to enum mapping, precomputed so category filters are a
+# single O(1) dict lookup instead of a getattr per request
+_CATEGORIES = Category.__members__
+
+# Accepted spellings of the available query parameter, parsed once in
+# the route so the database compares against a native boolean
+_BOOL_MAP = {
+    "true": True,
+    "1": True,
+    "yes": True,
+    "false": False,
+    "0": False,
+    "no": False,
+}
+
+# The Location header rule is static, so format it directly instead of
+# walking the URL map with url_for on every POST
+_PRODUCT_URL_TEMPLATE = "/products/{}"
+
+# Largest page a client may request with ?limit=
+_MAX_PAGE_SIZE = 200
+
 
 ######################################################################
 # H E A L T H   C H E C K
@@ -35,7 +68,7 @@ logger = logging.getLogger("flask.app")
 @app.route("/health")
 def healthcheck():
     """Let them know our heart is still beating"""
-    return jsonify(status=200, message="OK"), status.HTTP_200_OK
+    return jsonify(status=200, message="OK"), _OK
 
 
 ######################################################################
@@ -51,143 +84,203 @@ def index():
 ######################################################################
 #  U T I L I T Y   F U N C T I O N S
 ######################################################################
-def check_content_type(content_type):
-    """Checks that the media type is correct"""
-    if "Content-Type" not in request.headers:
-        app.logger.error("No Content-Type specified.")
-        abort(
-            status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-            f"Content-Type must be {content_type}",
-        )
+# Media types accepted for requests that carry a body
+_JSON_TYPES = frozenset({"application/json"})
 
-    if request.headers["Content-Type"] == content_type:
-        return
-
-    app.logger.error("Invalid Content-Type: %s", request.headers["Content-Type"])
-    abort(
-        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-        f"Content-Type must be {content_type}",
-    )
 
+@app.before_request
+def enforce_json_content_type():
+    """Rejects POST/PUT requests that are not JSON
 
-######################################################################
-# C R E A T E   A   N E W   P R O D U C T
-######################################################################
-@app.route("/products", methods=["POST"])
-def create_products():
-    """
-    Creates a Product
-    This endpoint will create a Product based the data in the body that is posted
+    Registered once instead of calling a checker in every write route.
+    Werkzeug parses request.mimetype lazily and caches it, so this also
+    accepts media types with parameters like a charset.
     """
+    if request.method in ("POST", "PUT") and request.mimetype not in _JSON_TYPES:
+        app.logger.error("Invalid Content-Type: %s", request.mimetype)
+        abort(
+            _UNSUPPORTED_MEDIA_TYPE,
+            "Content-Type must be application/json",
+        )
 
-    app.logger.info("Request to Create a Product...")
-    check_content_type("application/json")
 
-    data = request.get_json()
-    app.logger.info("Processing: %s", data)
-    product = Product()
-    product.deserialize(data)
-    product.create()
-    app.logger.info("Product with new id [%s] saved!", product.id)
+def orjson_response(data, status_code=_OK, headers=None):
+    """Builds a JSON response serialized with orjson
 
-    message = product.serialize()
+    orjson is much faster than the stdlib json used by jsonify and
+    matters most for list_products which serializes N products.
+    The default=str handles Decimal prices.
+    """
+    return app.response_class(
+        orjson.dumps(data, default=str),
+        status=status_code,
+        headers=headers,
+        mimetype="application/json",
+    )
 
-    #
-    # Uncomment this line of code once you implement READ A PRODUCT
-    #
-    location_url = url_for("get_products", product_id=product.id, _external=True)
 
-    return jsonify(message), status.HTTP_201_CREATED, {"Location": location_url}
+def _parse_pagination():
+    """Parses the optional limit and cursor query parameters
 
+    Pagination is opt-in via ?limit= so existing clients that expect
+    the bare list keep working; keyset paging via ?cursor= bounds
+    serialization cost per request. Returns (None, None) when no limit
+    was requested and aborts with 400 on bad values.
+    """
+    limit = request.args.get("limit")
+    cursor = None
+    if limit is not None:
+        try:
+            limit = min(int(limit), _MAX_PAGE_SIZE)
+            cursor = int(request.args.get("cursor", 0))
+        except ValueError:
+            abort(_BAD_REQUEST, "limit and cursor must be integers")
+        if limit < 1:
+            abort(_BAD_REQUEST, "limit must be a positive integer")
+    return limit, cursor
 
-######################################################################
-# L I S T   A L L   P R O D U C T S
-######################################################################
-
-#
-# PLACE YOUR CODE TO LIST ALL PRODUCTS HERE
-#
-@app.route("/products", methods=["GET"])
-def list_products():
-    """List products"""
-    logger.info("Listing products")
-
-    product_list = []
-    name = request.args.get("name")
-    category = request.args.get("category")
-    availability = request.args.get("available")
-    if name:
-        logger.info(f"listing products with name {name}")
-        products = Product.find_by_name(name)
-    elif category:
-        logger.info(f"listing products with category {category}")
-        category_enum = getattr(Category, category.upper())
-        products = Product.find_by_category(category_enum)
-    elif availability:
-        logger.info(f"listing products with availability {availability}")
-        products = Product.find_by_availability(availability)
-    else:
-        logger.info("listing all products")
-        products = Product.all()
-
-    for product in products:
-        product_list.append(product.serialize())
-    return product_list, status.HTTP_200_OK
 
 ######################################################################
-# R E A D   A   P R O D U C T
+# P R O D U C T   C O L L E C T I O N   /products
 ######################################################################
+class ProductCollectionView(MethodView):
+    """Dispatches GET and POST on /products from a single URL rule
 
-
-@app.route("/products/<int:product_id>", methods=["GET"])
-def get_products(product_id):
+    MethodView collapses the per-method rules into one, so Werkzeug
+    matches a single rule and then dispatches on the method.
     """
-    Get a product by its id
-    """
-    logger.info(f"Getting product {product_id}")
-    product_found = Product.find(product_id)
-    if not product_found:
-        abort(status.HTTP_404_NOT_FOUND, f"No product found with id {product_id}")
-    logger.info(f"product retrieved {product_found}")
-    return product_found.serialize(), status.HTTP_200_OK
-
-######################################################################
-# U P D A T E   A   P R O D U C T
-######################################################################
 
+    def post(self):
+        """
+        Creates a Product
+        This endpoint will create a Product based the data in the body that is posted
+        """
+
+        app.logger.info("Request to Create a Product...")
+
+        # cache=False since the body is only read once per request
+        data = request.get_json(cache=False)
+        app.logger.info("Processing: %s", data)
+        product = Product()
+        product.deserialize(data)
+        product.create()
+        app.logger.info("Product with new id [%s] saved!", product.id)
+
+        message = product.to_json_dict()
+        location_url = (
+            f"{request.host_url.rstrip('/')}{_PRODUCT_URL_TEMPLATE.format(product.id)}"
+        )
 
-@app.route("/products/<int:product_id>", methods=["PUT"])
-def update_product(product_id):
-    """
-    Updates a product
-    """
-    app.logger.info("Request to Update a Product...")
-    check_content_type("application/json")
+        return orjson_response(
+            message, _CREATED, headers={"Location": location_url}
+        )
 
-    data = request.get_json()
-    app.logger.info(f"Processing: {data}")
-    product_found = Product.find(product_id)
-    if not product_found:
-        abort(status.HTTP_404_NOT_FOUND, f"No product found with id {product_id}")
-    product_found_deserializable = product_found.deserialize(data)
-    product_found_deserializable.update()
-    return product_found_deserializable.serialize(), status.HTTP_200_OK
+    def get(self):
+        """List products"""
+        logger.info("Listing products")
+
+        name = request.args.get("name")
+        category = request.args.get("category")
+        availability = request.args.get("available")
+        limit, cursor = _parse_pagination()
+
+        if name:
+            logger.info("listing products with name %s", name)
+            rows = Product.list_dicts(name=name, cursor=cursor, limit=limit)
+        elif category:
+            logger.info("listing products with category %s", category)
+            category_enum = _CATEGORIES.get(category.upper())
+            if category_enum is None:
+                abort(_BAD_REQUEST, f"Unknown category {category}")
+            rows = Product.list_dicts(category=category_enum, cursor=cursor, limit=limit)
+        elif availability:
+            logger.info("listing products with availability %s", availability)
+            available_flag = _BOOL_MAP.get(availability.lower())
+            if available_flag is None:
+                abort(
+                    _BAD_REQUEST,
+                    f"Unknown availability {availability}",
+                )
+            rows = Product.list_dicts(available=available_flag, cursor=cursor, limit=limit)
+        else:
+            logger.info("listing all products")
+            rows = Product.list_dicts(cursor=cursor, limit=limit)
+
+        items = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "price": str(row.price),
+                "available": row.available,
+                "category": row.category.name,
+            }
+            for row in rows
+        ]
+
+        if limit is None:
+            return orjson_response(items, _OK)
+
+        next_cursor = items[-1]["id"] if len(items) == limit else None
+        return orjson_response({"items": items, "next_cursor": next_cursor}, _OK)
 
 
-####################################################
-# D E L E T E   A   P R O D U C T
 ######################################################################
+# S I N G L E   P R O D U C T   /products/<id>
+######################################################################
+class ProductView(MethodView):
+    """Dispatches GET, PUT and DELETE on /products/<product_id>"""
+
+    def get(self, product_id):
+        """
+        Get a product by its id
+        """
+        logger.info("Getting product %s", product_id)
+        product_found = Product.find(product_id)
+        if not product_found:
+            abort(_NOT_FOUND, f"No product found with id {product_id}")
+        logger.info("product retrieved %s", product_found)
+
+        # weak ETag from the last update time lets clients that already hold
+        # the current version skip the body entirely
+        etag_value = f"{product_found.id}-{int(product_found.updated_at.timestamp())}"
+        if request.if_none_match.contains_weak(etag_value):
+            return "", _NOT_MODIFIED, {"ETag": f'W/"{etag_value}"'}
+
+        return orjson_response(
+            product_found.to_json_dict(),
+            _OK,
+            headers={
+                "ETag": f'W/"{etag_value}"',
+                "Cache-Control": "private, must-revalidate",
+            },
+        )
 
-
-@app.route("/products/<int:product_id>", methods=["DELETE"])
-def delete_product(product_id):
-    """
-    Deletes a product
-    """
-    app.logger.info("Request to Delete a Product...")
-
-    product_found = Product.find(product_id)
-    if not product_found:
-        abort(status.HTTP_404_NOT_FOUND, f"No product found with id {product_id}")
-    product_found.delete()
-    return "", status.HTTP_204_NO_CONTENT
+    def put(self, product_id):
+        """
+        Updates a product
+        """
+        app.logger.info("Request to Update a Product...")
+
+        data = request.get_json(cache=False)
+        app.logger.info("Processing: %s", data)
+        updated = Product.update_by_id(product_id, data)
+        if not updated:
+            abort(_NOT_FOUND, f"No product found with id {product_id}")
+        return orjson_response(updated.to_json_dict(), _OK)
+
+    def delete(self, product_id):
+        """
+        Deletes a product
+        """
+        app.logger.info("Request to Delete a Product...")
+
+        if not Product.delete_by_id(product_id):
+            abort(_NOT_FOUND, f"No product found with id {product_id}")
+        return "", _NO_CONTENT
+
+
+app.add_url_rule("/products", view_func=ProductCollectionView.as_view("products"))
+app.add_url_rule(
+    "/products/<int:product_id>", view_func=ProductView.as_view("product")
+)
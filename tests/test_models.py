@@ -29,6 +29,7 @@ import unittest
 from decimal import Decimal
 from service.models import Product, Category, db, DataValidationError
 from service import app
+from tests import configure_test_app, reset_products_table
 from tests.factories import ProductFactory
 
 DATABASE_URI = os.getenv(
@@ -46,10 +47,7 @@ class TestProductModel(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """This runs once before the entire test suite"""
-        app.config["TESTING"] = True
-        app.config["DEBUG"] = False
-        app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
-        app.logger.setLevel(logging.CRITICAL)
+        configure_test_app(app, DATABASE_URI)
         Product.init_db(app)
 
     @classmethod
@@ -59,8 +57,7 @@ class TestProductModel(unittest.TestCase):
 
     def setUp(self):
         """This runs before each test"""
-        db.session.query(Product).delete()  # clean up the last tests
-        db.session.commit()
+        reset_products_table(db)  # clean up the last tests
 
     def tearDown(self):
         """This runs after each test"""
@@ -159,6 +156,25 @@ class TestProductModel(unittest.TestCase):
         with self.assertRaises(DataValidationError):
             product.update()
 
+    def test_update_by_id(self):
+        """Test to update a product in a single statement"""
+        product = ProductFactory()
+        product.id = None
+        product.create()
+        self.assertIsNotNone(product.id)
+        data = product.serialize()
+        data["description"] = "New description from PHF"
+        updated = Product.update_by_id(product.id, data)
+        self.assertIsNotNone(updated)
+        self.assertEqual(updated.id, product.id)
+        self.assertEqual(updated.description, "New description from PHF")
+
+    def test_update_by_id_not_found(self):
+        """Test to update a product id that is not in the database"""
+        product = ProductFactory()
+        data = product.serialize()
+        self.assertIsNone(Product.update_by_id(0, data))
+
     def test_delete_a_product(self):
         """Test to delete a product"""
 
@@ -169,31 +185,32 @@ class TestProductModel(unittest.TestCase):
         product.delete()
         self.assertEqual(len(Product.all()), 0)
 
+    def test_delete_by_id(self):
+        """Test to delete a product in a single statement"""
+        product = ProductFactory()
+        product.id = None
+        product.create()
+        self.assertEqual(len(Product.all()), 1)
+        self.assertTrue(Product.delete_by_id(product.id))
+        self.assertEqual(len(Product.all()), 0)
+        self.assertFalse(Product.delete_by_id(product.id))
+
     def test_list_all_products(self):
         """Test to list all products"""
         products = Product.all()
         self.assertEqual(len(products), 0)
-        for _ in range(5):
-            product = ProductFactory()
-            product.id = None
-            product.create()
+        Product.bulk_create([ProductFactory() for _ in range(5)])
         self.assertEqual(len(Product.all()), 5)
 
     def test_find_product_by_name(self):
         """Test to find a product by name"""
 
-        for _ in range(5):
-            product = ProductFactory()
-            product.id = None
-            product.create()
+        Product.bulk_create([ProductFactory() for _ in range(5)])
         products = Product.all()
 
         first_product = products[0]
         name = first_product.name
-        count = 0
-        for item in products:
-            if item.name == name:
-                count = count + 1
+        count = sum(1 for item in products if item.name == name)
         products_found = Product.find_by_name(name)
 
         self.assertEqual(products_found.count(), count)
@@ -202,18 +219,12 @@ class TestProductModel(unittest.TestCase):
 
     def test_find_product_by_availability(self):
         """Test to find a product by availability"""
-        for _ in range(10):
-            product = ProductFactory()
-            product.id = None
-            product.create()
+        Product.bulk_create([ProductFactory() for _ in range(10)])
         products = Product.all()
 
         first_product = products[0]
         availability = first_product.available
-        count = 0
-        for item in products:
-            if item.available == availability:
-                count = count + 1
+        count = sum(1 for item in products if item.available == availability)
         products_found = Product.find_by_availability(availability)
 
         self.assertEqual(products_found.count(), count)
@@ -222,24 +233,30 @@ class TestProductModel(unittest.TestCase):
 
     def test_find_by_category(self):
         """Test to find a products by category"""
-        for _ in range(10):
-            product = ProductFactory()
-            product.id = None
-            product.create()
+        Product.bulk_create([ProductFactory() for _ in range(10)])
         products = Product.all()
 
         first_product = products[0]
         category = first_product.category
-        count = 0
-        for item in products:
-            if item.category == category:
-                count = count + 1
+        count = sum(1 for item in products if item.category == category)
         products_found = Product.find_by_category(category)
 
         self.assertEqual(products_found.count(), count)
         for product_found in products_found:
             self.assertEqual(product_found.category, category)
 
+    def test_list_dicts(self):
+        """Test to list products as plain column rows"""
+        Product.bulk_create([ProductFactory() for _ in range(5)])
+        rows = list(Product.list_dicts())
+        self.assertEqual(len(rows), 5)
+
+        first_product = Product.all()[0]
+        rows_found = list(Product.list_dicts(name=first_product.name))
+        self.assertGreaterEqual(len(rows_found), 1)
+        for row in rows_found:
+            self.assertEqual(row.name, first_product.name)
+
     def test_deserialize(self):
         """Test to deserialize a product"""
 
@@ -30,7 +30,8 @@ from decimal import Decimal
 from unittest import TestCase
 from service import app
 from service.common import status
-from service.models import db, init_db, Product
+from service.models import db, init_db
+from tests import configure_test_app, reset_products_table
 from tests.factories import ProductFactory
 
 
@@ -55,11 +56,7 @@ class TestProductRoutes(TestCase):
     @classmethod
     def setUpClass(cls):
         """Run once before all tests"""
-        app.config["TESTING"] = True
-        app.config["DEBUG"] = False
-        # Set up the test database
-        app.config["SQLALCHEMY_DATABASE_URI"] = DATABASE_URI
-        app.logger.setLevel(logging.CRITICAL)
+        configure_test_app(app, DATABASE_URI)
         init_db(app)
 
     @classmethod
@@ -70,8 +67,7 @@ class TestProductRoutes(TestCase):
     def setUp(self):
         """Runs before each test"""
         self.client = app.test_client()
-        db.session.query(Product).delete()  # clean up the last tests
-        db.session.commit()
+        reset_products_table(db)  # clean up the last tests
 
     def tearDown(self):
         db.session.remove()
@@ -93,6 +89,25 @@ class TestProductRoutes(TestCase):
             products.append(test_product)
         return products
 
+    def _create_products_fast(self, count: int = 1, template: dict = None) -> list:
+        """Like _create_products but calls the factory only once
+
+        Faker generation is slow, so tests that don't care about
+        distinct values post copies of a single template payload.
+        Returns the created products as the dicts the API answered with.
+        """
+        base = template or ProductFactory().serialize()
+        products = []
+        for index in range(count):
+            response = self.client.post(
+                BASE_URL, json={**base, "name": f"{base['name']}-{index}"}
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_201_CREATED, "Could not create test product"
+            )
+            products.append(response.get_json())
+        return products
+
     ############################################################
     #  T E S T   C A S E S
     ############################################################
@@ -176,6 +191,19 @@ class TestProductRoutes(TestCase):
         self.assertEqual(product_found["available"], test_product.available)
         self.assertEqual(product_found["category"], test_product.category.name)
 
+    def test_get_product_not_modified(self):
+        """Test that a matching ETag returns 304 with no body"""
+        test_product = self._create_products()[0]
+        response = self.client.get(f"{BASE_URL}/{test_product.id}")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response.headers.get("ETag", None)
+        self.assertIsNotNone(etag)
+        response = self.client.get(
+            f"{BASE_URL}/{test_product.id}", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(len(response.data), 0)
+
     def test_get_product_not_found(self):
         """Test to get a product that is not in the db"""
         response = self.client.get(f"{BASE_URL}/0")
@@ -212,9 +240,9 @@ class TestProductRoutes(TestCase):
 
     def test_delete_a_product(self):
         """Test to delete a product from the database"""
-        test_product = self._create_products(5)[0]
+        test_product = self._create_products_fast(5)[0]
         count = self.get_product_count()
-        response_delete = self.client.delete(f"{BASE_URL}/{test_product.id}")
+        response_delete = self.client.delete(f"{BASE_URL}/{test_product['id']}")
         logging.debug(f"response_delete: {response_delete}")
         self.assertEqual(response_delete.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(len(response_delete.data), 0)
@@ -222,7 +250,7 @@ class TestProductRoutes(TestCase):
 
     def test_delete_a_product_not_found(self):
         """Test to delete a product from the database product not found error"""
-        self._create_products(5)
+        self._create_products_fast(5)
         response_delete = self.client.delete(f"{BASE_URL}/0")
         logging.debug(f"response_delete: {response_delete}")
         self.assertEqual(response_delete.status_code, status.HTTP_404_NOT_FOUND)
@@ -232,25 +260,44 @@ class TestProductRoutes(TestCase):
 
     def test_list_all(self):
         """Test to list all products"""
-        self._create_products(5)
+        self._create_products_fast(5)
         response = self.client.get(BASE_URL)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         response_data = response.get_json()
         self.assertEqual(len(response_data), 5)
 
+    def test_list_with_pagination(self):
+        """Test to list products a page at a time"""
+        self._create_products_fast(5)
+        response = self.client.get(f"{BASE_URL}?limit=2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        page = response.get_json()
+        self.assertEqual(len(page["items"]), 2)
+        self.assertIsNotNone(page["next_cursor"])
+
+        # walk the remaining pages with the returned cursor
+        found = list(page["items"])
+        while page["next_cursor"] is not None:
+            response = self.client.get(
+                f"{BASE_URL}?limit=2&cursor={page['next_cursor']}"
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.get_json()
+            found.extend(page["items"])
+        self.assertEqual(len(found), 5)
+
+    def test_list_with_bad_pagination(self):
+        """Test to list products with a bad limit value"""
+        response = self.client.get(f"{BASE_URL}?limit=two")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_list_by_name(self):
         """Test to list products by a name"""
         products = self._create_products(5)
         name = products[0].name
         logging.debug(f"name: {name}")
-        name_count = 0
-        for product in products:
-            logging.debug(f"product.name: {product.name}")
-
-            if product.name == name:
-                logging.debug("product found")
-                name_count = name_count + 1
-            logging.debug(f"name_count {name_count}")
+        name_count = sum(1 for product in products if product.name == name)
+        logging.debug(f"name_count {name_count}")
         response = self.client.get(f"{BASE_URL}?name={name}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         products_found = response.get_json()
@@ -263,14 +310,8 @@ class TestProductRoutes(TestCase):
         products = self._create_products(5)
         category = products[0].category
         logging.debug(f"category: {category}")
-        category_count = 0
-        for product in products:
-            logging.debug(f"product.category: {product.category}")
-
-            if product.category == category:
-                logging.debug("product found")
-                category_count = category_count + 1
-            logging.debug(f"category_count {category_count}")
+        category_count = sum(1 for product in products if product.category == category)
+        logging.debug(f"category_count {category_count}")
         response = self.client.get(f"{BASE_URL}?category={category.name}")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         products_found = response.get_json()
@@ -278,20 +319,21 @@ class TestProductRoutes(TestCase):
         for product in products_found:
             self.assertEqual(product["category"], category.name)
 
+    def test_list_by_unknown_category(self):
+        """Test to list products with an unknown category"""
+        response = self.client.get(f"{BASE_URL}?category=not-a-category")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = response.get_json()
+        logging.debug(f"data: {data}")
+        self.assertIn("Unknown category", data["message"])
+
     def test_list_by_availability(self):
         """Test to list products by the availability"""
         products = self._create_products(10)
         availability = products[0].available
         logging.debug(f"availability: {availability}")
-        availability_count = 0
-        for product in products:
-            logging.debug(f"product.available: {product.available}")
-            logging.debug(f"product.name: {product.name}")
-
-            if product.available == availability:
-                logging.debug("product found")
-                availability_count = availability_count + 1
-            logging.debug(f"availability_count {availability_count}")
+        availability_count = sum(1 for product in products if product.available == availability)
+        logging.debug(f"availability_count {availability_count}")
         response = self.client.get(f"{BASE_URL}?available={availability}")
 
         logging.debug(f"response: {response.get_json()}")
@@ -302,6 +344,14 @@ class TestProductRoutes(TestCase):
         for product in products_found:
             self.assertEqual(product["available"], availability)
 
+    def test_list_by_unknown_availability(self):
+        """Test to list products with an unknown availability value"""
+        response = self.client.get(f"{BASE_URL}?available=maybe")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        data = response.get_json()
+        logging.debug(f"data: {data}")
+        self.assertIn("Unknown availability", data["message"])
+
     ######################################################################
     # Utility functions
     ######################################################################